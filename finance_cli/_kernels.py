@@ -0,0 +1,59 @@
+"""Numeric kernels for chart rendering, JIT-compiled when Numba is available."""
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # Numba is optional; the NumPy fallback below is used
+    numba = None
+
+
+def _spark_indices(arr, width):
+    """Sample ``arr`` down to at most ``width`` points and scale each to a
+    bar index in [0, 7]. Flat series map to index 0.
+    """
+    n = arr.shape[0]
+    mn = arr.min()
+    mx = arr.max()
+    denom = mx - mn if mx > mn else 1.0
+    count = width if n > width else n
+    step = n / count
+    out = np.empty(count, np.int64)
+    for i in range(count):
+        k = int((arr[int(i * step)] - mn) / denom * 7)
+        if k < 0:
+            k = 0
+        if k > 7:
+            k = 7
+        out[i] = k
+    return out
+
+
+def _insight_extrema(totals, counts):
+    """Indices of the largest total and the highest transaction count,
+    found in a single pass over both arrays.
+    """
+    i_big = 0
+    i_freq = 0
+    for i in range(1, totals.shape[0]):
+        if totals[i] > totals[i_big]:
+            i_big = i
+        if counts[i] > counts[i_freq]:
+            i_freq = i
+    return i_big, i_freq
+
+
+if numba is not None:
+    spark_indices = numba.njit(cache=True, fastmath=True)(_spark_indices)
+    insight_extrema = numba.njit(cache=True)(_insight_extrema)
+else:
+    def spark_indices(arr, width):
+        n = arr.shape[0]
+        mn = arr.min()
+        mx = arr.max()
+        denom = mx - mn if mx > mn else 1.0
+        count = width if n > width else n
+        pos = (np.arange(count) * (n / count)).astype(np.int64)
+        return np.clip(((arr[pos] - mn) / denom * 7).astype(np.int64), 0, 7)
+
+    def insight_extrema(totals, counts):
+        return int(np.argmax(totals)), int(np.argmax(counts))
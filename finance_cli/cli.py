@@ -1,41 +1,109 @@
 """CLI interface for Finance CLI using Click and Rich."""
 import os
+import re
 import sys
+from functools import lru_cache
 from datetime import date, datetime, timedelta
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-from rich import box
 
-from .database import Database
-from .models import Expense, Category, Budget
-from .reports import ReportGenerator
-from .charts import ChartRenderer, format_currency
+# Rich, NumPy and the database/report modules are imported inside the
+# commands that need them: fast paths like `finance --version` and tab
+# completion then skip tens of ms of import cost.
 
-# Global console for rich output
-console = Console()
 
+class _LazyConsole:
+    """Global console that defers the Rich import until first output."""
+
+    _real = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._real is None:
+            from rich.console import Console
+            _LazyConsole._real = Console()
+        return getattr(_LazyConsole._real, name)
+
+
+console = _LazyConsole()
+
+# Flush long tables in chunks so Rich never materialises one giant
+# segment list and the first rows appear immediately
+_CHUNK_ROWS = 500
+
+
+def _batched(seq, size):
+    """Yield successive slices of at most `size` items."""
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+# Column layout for expense tables, defined once so per-chunk table
+# construction is a cheap loop instead of repeated add_column kwargs
+def _to_disp(cell):
+    """Render a raw SQL cell for display."""
+    return "NULL" if cell is None else str(cell)
+
+
+_EXPENSE_COLS = (
+    ("ID", {"style": "dim", "width": 6}),
+    ("Date", {"style": "cyan", "width": 12}),
+    ("Category", {"style": "green", "width": 18}),
+    # Every column fixed-width, so chunked listings stay aligned:
+    # auto widths would be recomputed per chunk
+    ("Description", {"width": 35}),
+    ("Amount", {"justify": "right", "style": "yellow", "width": 12}),
+    ("Method", {"style": "dim", "width": 10}),
+)
+
+
+@lru_cache(maxsize=4)
+def _db_for(data_dir):
+    from .database import Database
 
-def get_db() -> Database:
-    """Get database instance."""
-    data_dir = os.environ.get("FINANCE_CLI_DATA_DIR")
     return Database(data_dir)
 
 
+def get_db():
+    """Get database instance (memoized per data directory)."""
+    return _db_for(os.environ.get("FINANCE_CLI_DATA_DIR"))
+
+
+@lru_cache(maxsize=256)
+def _cat_by_name(data_dir, name):
+    """Memoized category lookup; cleared whenever a category is created."""
+    return _db_for(data_dir).get_category_by_name(name)
+
+
+def get_category_by_name(name):
+    """Look up a category by name, cached for the current invocation."""
+    return _cat_by_name(os.environ.get("FINANCE_CLI_DATA_DIR"), name)
+
+
+# Strip currency symbols and thousands separators in one C-level pass;
+# interior whitespace stays put so "1 234" is rejected as at baseline
+_AMOUNT_CLEANUP_RE = re.compile(r"[$,]")
+
+
+def _parse_iso_date(value: str) -> date:
+    """Parse a YYYY-MM-DD string without the strptime format machinery.
+
+    Unpadded parts (2024-1-5) parse too, as they did under strptime.
+    """
+    parts = value.split("-")
+    if len(parts) != 3:
+        raise ValueError(value)
+    return date(int(parts[0]), int(parts[1]), int(parts[2]))
+
+
 def validate_amount(ctx, param, value):
     """Validate and parse amount."""
     if value is None:
         return None
     try:
-        # Remove currency symbols and commas
-        cleaned = str(value).replace("$", "").replace(",", "").strip()
-        return Decimal(cleaned)
+        return Decimal(_AMOUNT_CLEANUP_RE.sub("", str(value).strip()))
     except InvalidOperation:
         raise click.BadParameter(f"Invalid amount: {value}")
 
@@ -45,11 +113,21 @@ def validate_date(ctx, param, value):
     if value is None:
         return None
     try:
-        return datetime.strptime(value, "%Y-%m-%d").date()
+        return _parse_iso_date(value)
     except ValueError:
         raise click.BadParameter(f"Invalid date format. Use YYYY-MM-DD: {value}")
 
 
+def validate_tags(ctx, param, value):
+    """Validate tags; the comma is the storage delimiter."""
+    for tag in value:
+        if "," in tag:
+            raise click.BadParameter(
+                f"Tags may not contain commas (use one -t per tag): {tag}"
+            )
+    return value
+
+
 @click.group()
 @click.version_option(version="1.0.0", prog_name="finance")
 @click.option('--data-dir', envvar='FINANCE_CLI_DATA_DIR',
@@ -95,7 +173,8 @@ def expense():
 @click.option('-p', '--payment', default='cash', 
               type=click.Choice(['cash', 'card', 'transfer', 'check', 'other']),
               help='Payment method')
-@click.option('-t', '--tag', multiple=True, help='Tags for the expense')
+@click.option('-t', '--tag', multiple=True, callback=validate_tags,
+              help='Tags for the expense')
 @click.option('--recurring', is_flag=True, help='Mark as recurring expense')
 def add(amount, category, description, expense_date, payment, tag, recurring):
     """Add a new expense.
@@ -106,14 +185,20 @@ def add(amount, category, description, expense_date, payment, tag, recurring):
         
         finance add 120.00 "Housing" --date 2024-01-15 -p card
     """
+    from rich.panel import Panel
+
+    from .charts import format_currency
+    from .models import Category, Expense
+
     db = get_db()
     
     # Find or create category
-    cat = db.get_category_by_name(category)
+    cat = get_category_by_name(category)
     if not cat:
         # Ask to create new category
         if click.confirm(f"Category '{category}' doesn't exist. Create it?"):
             cat_id = db.add_category(Category(name=category))
+            _cat_by_name.cache_clear()
         else:
             # Show available categories
             categories = db.get_categories()
@@ -166,6 +251,11 @@ def list_expenses(limit, today, this_week, this_month, filter_category, start_da
         
         finance list --start-date 2024-01-01 --end-date 2024-01-31
     """
+    from rich import box
+    from rich.table import Table
+
+    from .charts import format_currency
+
     db = get_db()
     
     # Determine date range
@@ -185,7 +275,7 @@ def list_expenses(limit, today, this_week, this_month, filter_category, start_da
     # Get category filter
     category_id = None
     if filter_category:
-        cat = db.get_category_by_name(filter_category)
+        cat = get_category_by_name(filter_category)
         if cat:
             category_id = cat.id
         else:
@@ -198,33 +288,43 @@ def list_expenses(limit, today, this_week, this_month, filter_category, start_da
         console.print("[dim]No expenses found.[/]")
         return
     
-    # Build table
-    table = Table(
-        show_header=True,
-        header_style="bold magenta",
-        box=box.SIMPLE
-    )
-    table.add_column("ID", style="dim", width=6)
-    table.add_column("Date", style="cyan", width=12)
-    table.add_column("Category", style="green", width=18)
-    table.add_column("Description")
-    table.add_column("Amount", justify="right", style="yellow")
-    table.add_column("Method", style="dim", width=10)
-    
-    total = Decimal(0)
-    
-    for e in expenses:
-        table.add_row(
-            str(e.id),
-            str(e.date),
-            e.category_name[:17],
-            e.description[:35] or "-",
-            format_currency(e.amount),
-            e.payment_method or "-"
+    def make_table(show_header: bool) -> Table:
+        table = Table(
+            show_header=show_header,
+            header_style="bold magenta",
+            box=box.SIMPLE
         )
-        total += e.amount
-    
-    console.print(table)
+        for name, kwargs in _EXPENSE_COLS:
+            table.add_column(name, **kwargs)
+        return table
+
+    # Push the reduction into SQLite: one SUM() over the same filter
+    # instead of accumulating amounts client-side (covers the full
+    # filtered set even when --limit truncates the rows shown)
+    total = db.sum_expenses(start, end, category_id)
+
+    # Print in chunks so very long listings stream to the terminal
+    # instead of building one table with every row in memory; the
+    # header renders once, on the first chunk only
+    for chunk_no, chunk in enumerate(_batched(expenses, _CHUNK_ROWS)):
+        table = make_table(show_header=chunk_no == 0)
+
+        ids = [str(e.id) for e in chunk]
+        dates = [str(e.date) for e in chunk]
+        cats = [e.category_name[:17] for e in chunk]
+
+        for i, e in enumerate(chunk):
+            table.add_row(
+                ids[i],
+                dates[i],
+                cats[i],
+                e.description[:35] or "-",
+                format_currency(e.amount),
+                e.payment_method or "-"
+            )
+
+        console.print(table)
+
     console.print(f"\n[dim]Showing {len(expenses)} expenses | Total: [/][yellow]{format_currency(total)}[/]")
 
 
@@ -248,7 +348,7 @@ def edit(expense_id):
     
     expense.amount = Decimal(str(new_amount))
     expense.description = new_desc
-    expense.date = datetime.strptime(new_date, "%Y-%m-%d").date()
+    expense.date = _parse_iso_date(new_date)
     
     if db.update_expense(expense):
         console.print("[green]✅ Expense updated successfully[/]")
@@ -273,6 +373,10 @@ def delete(expense_id):
 @click.argument('keyword')
 def search(keyword):
     """Search expenses by description."""
+    from rich.table import Table
+
+    from .charts import format_currency
+
     db = get_db()
     
     expenses = db.search_expenses(keyword)
@@ -311,6 +415,10 @@ def category():
 @category.command('list')
 def list_categories():
     """List all categories."""
+    from rich.table import Table
+
+    from .charts import format_currency
+
     db = get_db()
     
     categories = db.get_categories()
@@ -339,6 +447,8 @@ def list_categories():
 @click.option('--color', default='#6366f1', help='Category color (hex)')
 def add_category(name, description, budget, color):
     """Add a new category."""
+    from .models import Category
+
     db = get_db()
     
     cat = Category(
@@ -350,6 +460,7 @@ def add_category(name, description, budget, color):
     
     try:
         cat_id = db.add_category(cat)
+        _cat_by_name.cache_clear()
         console.print(f"[green]✅ Category '{name}' created (ID: {cat_id})[/]")
     except Exception as e:
         if "UNIQUE" in str(e):
@@ -372,6 +483,8 @@ def report():
 @click.option('--no-charts', is_flag=True, help='Hide charts')
 def monthly_report(year, month, no_charts):
     """Generate monthly spending report."""
+    from .reports import ReportGenerator
+
     db = get_db()
     generator = ReportGenerator(db)
     
@@ -386,6 +499,8 @@ def monthly_report(year, month, no_charts):
 @click.option('-y', '--year', type=int, default=date.today().year)
 def yearly_report(year):
     """Generate yearly spending report."""
+    from .reports import ReportGenerator
+
     db = get_db()
     generator = ReportGenerator(db)
     
@@ -398,9 +513,11 @@ def yearly_report(year):
 @click.option('--days', default=90, help='Number of days to include')
 def category_report(category_name, days):
     """Generate report for a specific category."""
+    from .reports import ReportGenerator
+
     db = get_db()
-    
-    cat = db.get_category_by_name(category_name)
+
+    cat = get_category_by_name(category_name)
     if not cat:
         console.print(f"[red]Category '{category_name}' not found[/]")
         return
@@ -416,6 +533,8 @@ def category_report(category_name, days):
 @report.command('budget')
 def budget_report():
     """Show budget status report."""
+    from .reports import ReportGenerator
+
     db = get_db()
     generator = ReportGenerator(db)
     
@@ -439,11 +558,14 @@ def budget():
 @click.option('--alert', default=80, help='Alert threshold percentage (default: 80)')
 def set_budget(amount, category, period, alert):
     """Set a budget for a category or overall."""
+    from .charts import format_currency
+    from .models import Budget
+
     db = get_db()
     
     category_id = None
     if category:
-        cat = db.get_category_by_name(category)
+        cat = get_category_by_name(category)
         if not cat:
             console.print(f"[red]Category '{category}' not found[/]")
             return
@@ -465,6 +587,10 @@ def set_budget(amount, category, period, alert):
 @budget.command('list')
 def list_budgets():
     """List all budgets."""
+    from rich.table import Table
+
+    from .charts import format_currency
+
     db = get_db()
     
     budgets = db.get_budgets()
@@ -495,6 +621,10 @@ def list_budgets():
 @cli.command()
 def stats():
     """Show database statistics and summary."""
+    from rich.panel import Panel
+
+    from .reports import ReportGenerator
+
     db = get_db()
     
     stats_data = db.get_stats()
@@ -545,6 +675,45 @@ def export(output_format, output, start_date, end_date):
         console.print(f"[red]Export failed: {e}[/]")
 
 
+@cli.command(name='import')
+@click.argument('input_file', type=click.Path(exists=True))
+def import_expenses(input_file):
+    """Import expenses from a CSV file (same columns as export).
+
+    All rows are inserted in one transaction via the bulk path, so a
+    large file costs a single commit instead of one per row.
+    """
+    import csv
+
+    from .models import Expense
+
+    db = get_db()
+    expenses = []
+    skipped = 0
+
+    with open(input_file, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                category = row.get('Category') or ''
+                cat = get_category_by_name(category) if category else None
+                tags_text = (row.get('Tags') or '').replace(', ', ',')
+                expenses.append(Expense(
+                    amount=Decimal(_AMOUNT_CLEANUP_RE.sub("", row['Amount'])),
+                    category_id=cat.id if cat else None,
+                    description=row.get('Description') or '',
+                    date=_parse_iso_date(row['Date']),
+                    payment_method=row.get('Payment Method') or 'cash',
+                    tags=tags_text.split(',') if tags_text else []
+                ))
+            except (KeyError, ValueError, InvalidOperation):
+                skipped += 1
+
+    count = db.add_expenses(expenses)
+    console.print(f"[green]✅ Imported {count} expense(s) from {input_file}[/]")
+    if skipped:
+        console.print(f"[yellow]Skipped {skipped} malformed row(s)[/]")
+
+
 @cli.command()
 @click.argument('query')
 def sql(query):
@@ -552,6 +721,8 @@ def sql(query):
     
     Example: finance sql "SELECT * FROM expenses LIMIT 10"
     """
+    from rich.table import Table
+
     db = get_db()
     
     try:
@@ -572,7 +743,7 @@ def sql(query):
                 table.add_column(col)
             
             for row in rows[:100]:  # Limit to 100 rows
-                table.add_row(*[str(cell) if cell is not None else "NULL" for cell in row])
+                table.add_row(*map(_to_disp, row))
             
             console.print(table)
             
@@ -1,7 +1,7 @@
 """Database layer for Finance CLI - SQLite with local storage."""
 import sqlite3
 import os
-import json
+import threading
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from pathlib import Path
@@ -11,6 +11,87 @@ from contextlib import contextmanager
 from .models import Expense, Category, Budget, MonthlySummary, CategorySummary
 
 
+# Hot-path SQL hoisted to module constants: passing the identical string
+# object each call makes the sqlite3 statement-cache lookup deterministic
+# and skips re-parsing/re-planning
+_SQL_ADD_EXPENSE = """
+    INSERT INTO expenses (amount, category_id, description, date,
+                        payment_method, tags, is_recurring)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_GET_EXPENSE = """
+    SELECT e.*, c.name as category_name
+    FROM expenses e
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE e.id = ?
+"""
+
+_SQL_UPDATE_EXPENSE = """
+    UPDATE expenses
+    SET amount = ?, category_id = ?, description = ?, date = ?,
+        payment_method = ?, tags = ?, is_recurring = ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+"""
+
+_SQL_DELETE_EXPENSE = "DELETE FROM expenses WHERE id = ?"
+
+_SQL_SEARCH_EXPENSES = """
+    SELECT e.*, c.name as category_name
+    FROM expenses e
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE e.description LIKE ?
+    ORDER BY e.date DESC LIMIT ?
+"""
+
+_SQL_SET_BUDGET = """
+    INSERT INTO budgets (category_id, amount, period, start_date, end_date, alert_threshold)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(COALESCE(category_id, -1)) DO UPDATE SET
+        amount = excluded.amount,
+        period = excluded.period,
+        start_date = excluded.start_date,
+        end_date = excluded.end_date,
+        alert_threshold = excluded.alert_threshold
+    RETURNING id
+"""
+
+_SQL_SEARCH_EXPENSES_FTS = """
+    SELECT e.*, c.name as category_name
+    FROM expenses_fts f
+    JOIN expenses e ON e.id = f.rowid
+    LEFT JOIN categories c ON e.category_id = c.id
+    WHERE expenses_fts MATCH ?
+    ORDER BY e.date DESC LIMIT ?
+"""
+
+# Convert money and dates at the SQLite boundary instead of per-call
+# Python code: DECIMAL-declared columns come back as Decimal directly,
+# Decimal parameters are stored via str (NUMERIC affinity keeps them
+# numeric on disk, so existing databases stay compatible), and
+# date/datetime parameters bind directly with the ISO rendering done
+# once at adapt time. DATE/TIMESTAMP columns are pinned to plain ISO
+# strings so PARSE_DECLTYPES does not hand the models datetime objects
+# via the deprecated default converters.
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, datetime.isoformat)
+sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+sqlite3.register_converter("DATE", lambda b: b.decode())
+sqlite3.register_converter("TIMESTAMP", lambda b: b.decode())
+
+# Bumped whenever _init_db's schema changes; databases already at this
+# version skip schema creation entirely on startup.
+# 1: initial schema under version control
+# 2: tags stored as comma-joined text instead of JSON arrays
+# 3: LOWER(name) expression index dropped (name lookups are answered
+#    from the in-process category cache, never from SQL)
+# 4: one budget per category enforced by a unique index so set_budget
+#    can upsert
+_SCHEMA_VERSION = 4
+
+
 class Database:
     """SQLite database manager for local finance data."""
     
@@ -35,197 +116,418 @@ class Database:
             # Store in user's home directory for privacy
             self.data_dir = Path.home() / ".finance-cli"
         
-        self.data_dir.mkdir(exist_ok=True)
         self.db_path = self.data_dir / "finance.db"
-        self._init_db()
-    
+        self._conn = None
+        self._lock = threading.Lock()
+        # Categories change rarely but are resolved on every add; cache
+        # them in-process and drop the cache on any category write
+        self._cat_by_name = None
+        # In-place edits move neither MAX(id) nor COUNT(*), so count
+        # them separately for data_fingerprint
+        self._update_serial = 0
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+        """Context manager yielding the cached database connection.
+
+        The connection is opened lazily on first use and reused for the
+        lifetime of the Database: re-connecting per call cost more than
+        the simple queries it served. Schema setup and even the data
+        directory are deferred to this point, so constructing a Database
+        (e.g. for --help) touches no disk. Call close() to release it.
+        """
+        with self._lock:
+            if self._conn is None:
+                self.data_dir.mkdir(exist_ok=True)
+                self._conn = sqlite3.connect(
+                    str(self.db_path),
+                    check_same_thread=False,
+                    cached_statements=256,
+                    detect_types=sqlite3.PARSE_DECLTYPES
+                )
+                # No row factory: every consumer indexes positionally,
+                # so wrapping each result in sqlite3.Row is wasted work.
+                # Set cursor.row_factory locally if named access is needed.
+                self._apply_pragmas(self._conn)
+                self._init_db(self._conn)
+                self._conn.commit()
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    @staticmethod
+    def _apply_pragmas(conn):
+        """Tune the connection: WAL avoids an fsync per commit, NORMAL
+        sync is safe with WAL, and the larger in-memory caches keep hot
+        pages resident across the long-lived connection."""
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-20000;
+            PRAGMA mmap_size=268435456;
+            PRAGMA foreign_keys=ON;
+        """)
+
+    def close(self):
+        """Close the cached connection, if open."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
-    def _init_db(self):
-        """Initialize database schema."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Categories table
+    def _init_db(self, conn):
+        """Initialize database schema on a freshly opened connection."""
+        cursor = conn.cursor()
+
+        # Databases already at the current schema version skip the
+        # DDL below; a single sqlite_master probe decides the
+        # search path
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        if version >= _SCHEMA_VERSION:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+            )
+            self._has_fts = cursor.fetchone()[0] > 0
+            return
+
+        # Categories table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS categories (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                budget_limit DECIMAL(10, 2),
+                color TEXT DEFAULT '#6366f1',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Expenses table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS expenses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                amount DECIMAL(10, 2) NOT NULL,
+                category_id INTEGER,
+                description TEXT,
+                date DATE NOT NULL,
+                payment_method TEXT DEFAULT 'cash',
+                tags TEXT DEFAULT '',
+                is_recurring BOOLEAN DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE SET NULL
+            )
+        """)
+        
+        # Budgets table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS budgets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                category_id INTEGER,
+                amount DECIMAL(10, 2) NOT NULL,
+                period TEXT DEFAULT 'monthly',
+                start_date DATE,
+                end_date DATE,
+                alert_threshold INTEGER DEFAULT 80,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
+            )
+        """)
+        
+        # Indexes for performance. (category_id, date) serves the
+        # category-first joins in the analytics queries and makes the
+        # old single-column category index redundant. Name lookups are
+        # case-insensitive but answered from the in-process cache, so
+        # the categories table needs no extra index beyond UNIQUE(name)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)")
+        cursor.execute("DROP INDEX IF EXISTS idx_expenses_category")
+        cursor.execute("DROP INDEX IF EXISTS idx_categories_lower_name")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date_category ON expenses(date, category_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category_date ON expenses(category_id, date)")
+        cursor.execute("ANALYZE")
+
+        # Full-text index over descriptions: LIKE '%kw%' cannot use
+        # an index and scans the whole table. Triggers keep the FTS
+        # table in sync; search falls back to LIKE when the SQLite
+        # build lacks FTS5.
+        try:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts'"
+            )
+            fts_missing = cursor.fetchone()[0] == 0
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    budget_limit DECIMAL(10, 2),
-                    color TEXT DEFAULT '#6366f1',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
+                CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts
+                USING fts5(description, content='expenses', content_rowid='id')
             """)
-            
-            # Expenses table
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    amount DECIMAL(10, 2) NOT NULL,
-                    category_id INTEGER,
-                    description TEXT,
-                    date DATE NOT NULL,
-                    payment_method TEXT DEFAULT 'cash',
-                    tags TEXT DEFAULT '[]',
-                    is_recurring BOOLEAN DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE SET NULL
-                )
+                CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+                    INSERT INTO expenses_fts(rowid, description)
+                    VALUES (new.id, new.description);
+                END
             """)
-            
-            # Budgets table
             cursor.execute("""
-                CREATE TABLE IF NOT EXISTS budgets (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    category_id INTEGER,
-                    amount DECIMAL(10, 2) NOT NULL,
-                    period TEXT DEFAULT 'monthly',
-                    start_date DATE,
-                    end_date DATE,
-                    alert_threshold INTEGER DEFAULT 80,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
-                )
+                CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+                    INSERT INTO expenses_fts(expenses_fts, rowid, description)
+                    VALUES ('delete', old.id, old.description);
+                END
             """)
-            
-            # Indexes for performance
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date_category ON expenses(date, category_id)")
-            
-            # Insert default categories if empty
-            cursor.execute("SELECT COUNT(*) FROM categories")
-            if cursor.fetchone()[0] == 0:
-                cursor.executemany(
-                    """INSERT INTO categories (name, description, color, budget_limit) 
-                       VALUES (?, ?, ?, ?)""",
-                    self.DEFAULT_CATEGORIES
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE ON expenses BEGIN
+                    INSERT INTO expenses_fts(expenses_fts, rowid, description)
+                    VALUES ('delete', old.id, old.description);
+                    INSERT INTO expenses_fts(rowid, description)
+                    VALUES (new.id, new.description);
+                END
+            """)
+            if fts_missing:
+                # Index rows that predate the FTS table
+                cursor.execute("INSERT INTO expenses_fts(expenses_fts) VALUES('rebuild')")
+            self._has_fts = True
+        except sqlite3.OperationalError:
+            self._has_fts = False
+        
+        # Seed default categories; the UNIQUE(name) constraint makes
+        # this a no-op on databases that already have them, without a
+        # COUNT(*) pre-check
+        cursor.executemany(
+            """INSERT OR IGNORE INTO categories (name, description, color, budget_limit)
+               VALUES (?, ?, ?, ?)""",
+            self.DEFAULT_CATEGORIES
+        )
+
+        if version < 4:
+            # One budget per category (NULL = overall, folded to -1 so
+            # the index treats it as a single slot); keep only the most
+            # recent row per category before enforcing it
+            cursor.execute("""
+                DELETE FROM budgets WHERE id NOT IN (
+                    SELECT MAX(id) FROM budgets GROUP BY COALESCE(category_id, -1)
                 )
-    
+            """)
+            cursor.execute("""
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_budgets_category
+                ON budgets(COALESCE(category_id, -1))
+            """)
+
+        if version < 2:
+            # Rewrite JSON-array tags ('["a", "b"]') as comma-joined
+            # text ('a,b'), so reads split instead of json.loads per row.
+            # A comma inside a JSON-era tag would read back as two tags,
+            # so it is folded to a space rather than silently split
+            import json
+            cursor.execute("SELECT id, tags FROM expenses WHERE tags LIKE '[%'")
+            cursor.executemany(
+                "UPDATE expenses SET tags = ? WHERE id = ?",
+                [(",".join(t.replace(",", " ") for t in json.loads(tags)), row_id)
+                 for row_id, tags in cursor.fetchall()]
+            )
+
+        cursor.execute("PRAGMA user_version = %d" % _SCHEMA_VERSION)
+
     # === Expense Operations ===
-    
+
+    @staticmethod
+    def _join_tags(tags: List[str]) -> str:
+        """Serialize tags to the comma-joined storage format.
+
+        The comma is the storage delimiter, so a tag containing one
+        would silently read back as two tags; reject it here instead.
+        """
+        for tag in tags:
+            if "," in tag:
+                raise ValueError(f"Tags may not contain commas: {tag!r}")
+        return ",".join(sorted(set(tags)))
+
     def add_expense(self, expense: Expense) -> int:
         """Add a new expense and return its ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO expenses (amount, category_id, description, date, 
-                                    payment_method, tags, is_recurring)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                float(expense.amount),
+            cursor.execute(_SQL_ADD_EXPENSE, (
+                expense.amount,
                 expense.category_id,
                 expense.description,
-                expense.date.isoformat(),
+                expense.date,
                 expense.payment_method,
-                json.dumps(expense.tags),
+                self._join_tags(expense.tags),
                 expense.is_recurring
             ))
             return cursor.lastrowid
-    
+
+    def add_expenses(self, expenses: List[Expense]) -> int:
+        """Add many expenses in one transaction; returns the count added.
+
+        executemany reuses a single prepared statement across all rows,
+        so bulk imports skip per-row parse/plan and commit once.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(_SQL_ADD_EXPENSE, (
+                (
+                    e.amount,
+                    e.category_id,
+                    e.description,
+                    e.date,
+                    e.payment_method,
+                    self._join_tags(e.tags),
+                    e.is_recurring
+                )
+                for e in expenses
+            ))
+            return cursor.rowcount
+
     def get_expense(self, expense_id: int) -> Optional[Expense]:
         """Get a single expense by ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT e.*, c.name as category_name 
-                FROM expenses e
-                LEFT JOIN categories c ON e.category_id = c.id
-                WHERE e.id = ?
-            """, (expense_id,))
+            cursor.execute(_SQL_GET_EXPENSE, (expense_id,))
             row = cursor.fetchone()
-            return Expense.from_row(tuple(row)) if row else None
-    
+            return Expense.from_row(row) if row else None
+
     def update_expense(self, expense: Expense) -> bool:
         """Update an existing expense."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE expenses 
-                SET amount = ?, category_id = ?, description = ?, date = ?,
-                    payment_method = ?, tags = ?, is_recurring = ?,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            """, (
-                float(expense.amount),
+            cursor.execute(_SQL_UPDATE_EXPENSE, (
+                expense.amount,
                 expense.category_id,
                 expense.description,
-                expense.date.isoformat(),
+                expense.date,
                 expense.payment_method,
-                json.dumps(expense.tags),
+                self._join_tags(expense.tags),
                 expense.is_recurring,
                 expense.id
             ))
+            self._update_serial += 1
             return cursor.rowcount > 0
-    
+
     def delete_expense(self, expense_id: int) -> bool:
         """Delete an expense by ID."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+            cursor.execute(_SQL_DELETE_EXPENSE, (expense_id,))
             return cursor.rowcount > 0
     
-    def list_expenses(
-        self,
-        start_date: Optional[date] = None,
-        end_date: Optional[date] = None,
-        category_id: Optional[int] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[Expense]:
-        """List expenses with optional filtering."""
+    @staticmethod
+    def _expense_query(
+        start_date: Optional[date],
+        end_date: Optional[date],
+        category_id: Optional[int],
+        limit: int,
+        offset: int
+    ) -> Tuple[str, list]:
+        """Build the filtered expense SELECT and its parameters."""
         query = """
-            SELECT e.*, c.name as category_name 
+            SELECT e.*, c.name as category_name
             FROM expenses e
             LEFT JOIN categories c ON e.category_id = c.id
             WHERE 1=1
         """
         params = []
-        
+
         if start_date:
             query += " AND e.date >= ?"
-            params.append(start_date.isoformat())
+            params.append(start_date)
         if end_date:
             query += " AND e.date <= ?"
-            params.append(end_date.isoformat())
+            params.append(end_date)
         if category_id:
             query += " AND e.category_id = ?"
             params.append(category_id)
-        
+
         query += " ORDER BY e.date DESC, e.created_at DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
-        
+        return query, params
+
+    def list_expenses(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Expense]:
+        """List expenses with optional filtering."""
+        query, params = self._expense_query(start_date, end_date, category_id, limit, offset)
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return [Expense.from_row(tuple(row)) for row in cursor.fetchall()]
-    
-    def search_expenses(self, keyword: str, limit: int = 50) -> List[Expense]:
-        """Search expenses by description."""
+            return [Expense.from_row(row) for row in cursor]
+
+    def list_expense_rows(
+        self,
+        start_date: date,
+        end_date: date,
+        category_id: int,
+        limit: int = 20
+    ) -> List[tuple]:
+        """Narrow (date, description, amount, payment_method) rows.
+
+        Serves display tables that don't need full Expense objects or
+        the category-name join; the (category_id, date) index drives
+        the whole scan.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT e.*, c.name as category_name 
-                FROM expenses e
-                LEFT JOIN categories c ON e.category_id = c.id
-                WHERE e.description LIKE ?
-                ORDER BY e.date DESC LIMIT ?
-            """, (f"%{keyword}%", limit))
-            return [Expense.from_row(tuple(row)) for row in cursor.fetchall()]
+                SELECT date, description, amount, payment_method
+                FROM expenses
+                WHERE category_id = ? AND date BETWEEN ? AND ?
+                ORDER BY date DESC, created_at DESC LIMIT ?
+            """, (category_id, start_date, end_date, limit))
+            return cursor.fetchall()
+
+    def sum_expenses(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None
+    ) -> Decimal:
+        """Sum expense amounts matching the filters inside SQLite."""
+        return self.expense_totals(start_date, end_date, category_id)[0]
+
+    def expense_totals(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id: Optional[int] = None
+    ) -> Tuple[Decimal, int]:
+        """Total amount and row count matching the filters, in one query."""
+        query = "SELECT COALESCE(SUM(amount), 0), COUNT(*) FROM expenses WHERE 1=1"
+        params = []
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+        if category_id:
+            query += " AND category_id = ?"
+            params.append(category_id)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            total, count = cursor.fetchone()
+            return Decimal(str(total or 0)), count
+
+    def search_expenses(self, keyword: str, limit: int = 50) -> List[Expense]:
+        """Search expenses by description (FTS-indexed when available)."""
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if self._has_fts:
+                # Quoted phrase with prefix match, keyword-safe
+                match = '"%s"*' % keyword.replace('"', '""')
+                cursor.execute(_SQL_SEARCH_EXPENSES_FTS, (match, limit))
+            else:
+                cursor.execute(_SQL_SEARCH_EXPENSES, (f"%{keyword}%", limit))
+            return [Expense.from_row(row) for row in cursor]
     
     # === Category Operations ===
     
@@ -234,21 +536,29 @@ class Database:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM categories ORDER BY name")
-            return [Category.from_row(tuple(row)) for row in cursor.fetchall()]
+            return [Category.from_row(row) for row in cursor]
     
-    def get_category_by_name(self, name: str) -> Optional[Category]:
-        """Get category by name (case-insensitive)."""
+    def get_category_by_id(self, category_id: int) -> Optional[Category]:
+        """Get a single category by primary key."""
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM categories WHERE LOWER(name) = LOWER(?)", 
-                (name,)
-            )
+            cursor.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
             row = cursor.fetchone()
-            return Category.from_row(tuple(row)) if row else None
+            return Category.from_row(row) if row else None
+
+    def get_category_by_name(self, name: str) -> Optional[Category]:
+        """Get category by name (case-insensitive).
+
+        Answered from an in-process dict built on first call, so bulk
+        imports resolve names without a query per expense.
+        """
+        if self._cat_by_name is None:
+            self._cat_by_name = {c.name.lower(): c for c in self.get_categories()}
+        return self._cat_by_name.get(name.lower())
     
     def add_category(self, category: Category) -> int:
         """Add a new category."""
+        self._cat_by_name = None
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -257,13 +567,14 @@ class Database:
             """, (
                 category.name,
                 category.description,
-                float(category.budget_limit) if category.budget_limit else None,
+                category.budget_limit if category.budget_limit else None,
                 category.color
             ))
             return cursor.lastrowid
     
     def update_category(self, category: Category) -> bool:
         """Update a category."""
+        self._cat_by_name = None
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
@@ -273,7 +584,7 @@ class Database:
             """, (
                 category.name,
                 category.description,
-                float(category.budget_limit) if category.budget_limit else None,
+                category.budget_limit if category.budget_limit else None,
                 category.color,
                 category.id
             ))
@@ -281,6 +592,7 @@ class Database:
     
     def delete_category(self, category_id: int, reassign_to: Optional[int] = None) -> bool:
         """Delete a category and optionally reassign its expenses."""
+        self._cat_by_name = None
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
@@ -296,46 +608,51 @@ class Database:
     # === Budget Operations ===
     
     def set_budget(self, budget: Budget) -> int:
-        """Set or update a budget."""
+        """Set or update a budget.
+
+        A single upsert against the per-category unique index replaces
+        the old SELECT-then-INSERT-or-UPDATE round trips; RETURNING
+        hands back the id either way.
+        """
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Check if budget exists
-            cursor.execute(
-                "SELECT id FROM budgets WHERE category_id IS ?",
-                (budget.category_id,)
-            )
-            existing = cursor.fetchone()
-            
-            if existing:
-                cursor.execute("""
-                    UPDATE budgets 
-                    SET amount = ?, period = ?, start_date = ?, 
-                        end_date = ?, alert_threshold = ?
-                    WHERE id = ?
-                """, (
-                    float(budget.amount),
-                    budget.period,
-                    budget.start_date.isoformat() if budget.start_date else None,
-                    budget.end_date.isoformat() if budget.end_date else None,
-                    budget.alert_threshold,
-                    existing[0]
-                ))
-                return existing[0]
-            else:
-                cursor.execute("""
-                    INSERT INTO budgets (category_id, amount, period, start_date, end_date, alert_threshold)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    budget.category_id,
-                    float(budget.amount),
-                    budget.period,
-                    budget.start_date.isoformat() if budget.start_date else None,
-                    budget.end_date.isoformat() if budget.end_date else None,
-                    budget.alert_threshold
-                ))
-                return cursor.lastrowid
+            cursor.execute(_SQL_SET_BUDGET, (
+                budget.category_id,
+                budget.amount,
+                budget.period,
+                budget.start_date,
+                budget.end_date,
+                budget.alert_threshold
+            ))
+            return cursor.fetchone()[0]
     
+    def get_budget_status(
+        self,
+        period_start: date,
+        period_end: date
+    ) -> List[Tuple[Budget, Decimal]]:
+        """Get every budget with its spend over the period, in one query.
+
+        The overall budget (NULL category) is matched against all
+        expenses in the range, per-category budgets only against their
+        own; no separate per-category aggregation pass is needed.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT b.*, c.name as category_name,
+                       COALESCE(SUM(e.amount), 0) as spent
+                FROM budgets b
+                LEFT JOIN categories c ON b.category_id = c.id
+                LEFT JOIN expenses e
+                    ON (b.category_id IS NULL OR e.category_id = b.category_id)
+                    AND e.date BETWEEN ? AND ?
+                GROUP BY b.id
+                ORDER BY b.category_id IS NULL DESC, c.name
+            """, (period_start, period_end))
+            return [(Budget.from_row(row), Decimal(str(row[9])))
+                    for row in cursor]
+
     def get_budgets(self) -> List[Budget]:
         """Get all budgets."""
         with self._get_connection() as conn:
@@ -346,51 +663,68 @@ class Database:
                 LEFT JOIN categories c ON b.category_id = c.id
                 ORDER BY b.category_id IS NULL DESC, c.name
             """)
-            return [Budget.from_row(tuple(row)) for row in cursor.fetchall()]
+            return [Budget.from_row(row) for row in cursor]
     
     # === Analytics & Reports ===
     
     def get_spending_by_category(
-        self, 
+        self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        top_n: Optional[int] = None
     ) -> List[CategorySummary]:
-        """Get spending summary by category."""
+        """Get spending summary by category.
+
+        When top_n is given only the leading groups leave SQLite (the
+        window-aggregate grand total is computed before LIMIT, so
+        percentages stay relative to the full period).
+        """
         if not end_date:
             end_date = date.today()
         if not start_date:
             start_date = end_date.replace(day=1)
-        
+
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Get total spent
-            cursor.execute("""
-                SELECT COALESCE(SUM(amount), 0) FROM expenses
-                WHERE date BETWEEN ? AND ?
-            """, (start_date.isoformat(), end_date.isoformat()))
-            total = Decimal(str(cursor.fetchone()[0] or 0))
-            
-            # Get per-category breakdown
-            cursor.execute("""
-                SELECT 
+
+            # One pass over the date range: per-category totals plus the
+            # grand total via a window aggregate, instead of scanning the
+            # expenses twice. Grouping from the expenses side keeps
+            # uncategorized spend in the grand total; its NULL-category
+            # group is skipped below, as before.
+            query = """
+                SELECT
                     c.id,
                     c.name,
                     c.color,
                     COALESCE(SUM(e.amount), 0) as total,
                     COUNT(e.id) as count,
-                    c.budget_limit
-                FROM categories c
-                LEFT JOIN expenses e ON c.id = e.category_id 
-                    AND e.date BETWEEN ? AND ?
+                    c.budget_limit,
+                    SUM(SUM(e.amount)) OVER () as grand_total
+                FROM expenses e
+                LEFT JOIN categories c ON c.id = e.category_id
+                WHERE e.date BETWEEN ? AND ?
                 GROUP BY c.id
-                HAVING total > 0
                 ORDER BY total DESC
-            """, (start_date.isoformat(), end_date.isoformat()))
-            
+            """
+            params = [start_date, end_date]
+            if top_n is not None:
+                # One row of headroom in case the skipped NULL-category
+                # group lands inside the requested window
+                query += " LIMIT ?"
+                params.append(top_n + 1)
+            cursor.execute(query, params)
+
+            rows = cursor.fetchall()
+            total = Decimal(str(rows[0][6])) if rows else Decimal(0)
+
             results = []
-            for row in cursor.fetchall():
+            for row in rows:
+                if row[0] is None:
+                    continue
                 cat_total = Decimal(str(row[3]))
+                if cat_total <= 0:
+                    continue
                 budget_limit = Decimal(str(row[5])) if row[5] else None
                 budget_used = None
                 if budget_limit and budget_limit > 0:
@@ -406,8 +740,8 @@ class Database:
                     budget_limit=budget_limit,
                     budget_used_percentage=budget_used
                 ))
-            
-            return results
+
+            return results[:top_n] if top_n is not None else results
     
     def get_monthly_summary(self, year: int, month: int) -> MonthlySummary:
         """Get summary for a specific month."""
@@ -425,7 +759,7 @@ class Database:
                 SELECT COALESCE(SUM(amount), 0), COUNT(*)
                 FROM expenses
                 WHERE date BETWEEN ? AND ?
-            """, (start_date.isoformat(), end_date.isoformat()))
+            """, (start_date, end_date))
             total, count = cursor.fetchone()
             total = Decimal(str(total or 0))
             
@@ -438,10 +772,16 @@ class Database:
                 GROUP BY c.id
                 HAVING SUM(e.amount) > 0
                 ORDER BY SUM(e.amount) DESC
-            """, (start_date.isoformat(), end_date.isoformat()))
+            """, (start_date, end_date))
             
-            breakdown = {row[0]: Decimal(str(row[1])) for row in cursor.fetchall()}
-            top_category = max(breakdown, key=breakdown.get) if breakdown else ""
+            # Rows arrive sorted by total DESC, so the first category is
+            # the top one — no extra max() pass over the dict
+            breakdown = {}
+            top_category = ""
+            for row in cursor:
+                if not top_category:
+                    top_category = row[0]
+                breakdown[row[0]] = Decimal(str(row[1]))
             
             # Previous month for comparison
             prev_start = start_date.replace(day=1) - timedelta(days=1)
@@ -453,7 +793,7 @@ class Database:
                 SELECT COALESCE(SUM(amount), 0)
                 FROM expenses
                 WHERE date >= ? AND date < ?
-            """, (prev_start.isoformat(), start_date.isoformat()))
+            """, (prev_start, start_date))
             prev_total = Decimal(str(cursor.fetchone()[0] or 0))
             
             vs_prev = None
@@ -474,65 +814,217 @@ class Database:
                 vs_previous_month=vs_prev
             )
     
+    def get_yearly_totals(self, year: int) -> Tuple[Decimal, int]:
+        """Total spend and transaction count for a year in one query.
+
+        The date-range filter rides the date index; no per-month rows
+        are materialized.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT COALESCE(SUM(amount), 0), COUNT(*)
+                FROM expenses
+                WHERE date >= ? AND date < ?
+            """, (date(year, 1, 1), date(year + 1, 1, 1)))
+            total, count = cursor.fetchone()
+            return Decimal(str(total or 0)), count
+
     def get_yearly_summary(self, year: int) -> List[MonthlySummary]:
-        """Get monthly summaries for a year."""
+        """Get monthly summaries for a year.
+
+        One grouped query for monthly totals and one for per-month
+        category breakdowns, instead of twelve get_monthly_summary
+        calls issuing three queries each.
+        """
+        start = date(year, 1, 1)
+        end = date(year + 1, 1, 1)
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT CAST(strftime('%m', date) AS INTEGER) AS m,
+                       COALESCE(SUM(amount), 0),
+                       COUNT(*)
+                FROM expenses
+                WHERE date >= ? AND date < ?
+                GROUP BY m
+            """, (start, end))
+            totals = {row[0]: (Decimal(str(row[1] or 0)), row[2]) for row in cursor}
+
+            cursor.execute("""
+                SELECT CAST(strftime('%m', e.date) AS INTEGER) AS m,
+                       c.name,
+                       SUM(e.amount) AS total
+                FROM expenses e
+                JOIN categories c ON e.category_id = c.id
+                WHERE e.date >= ? AND e.date < ?
+                GROUP BY m, c.id
+                ORDER BY m, total DESC
+            """, (start, end))
+            breakdowns = {}
+            for m, name, total in cursor:
+                breakdowns.setdefault(m, {})[name] = Decimal(str(total))
+
+            # December of the previous year anchors January's comparison
+            cursor.execute("""
+                SELECT COALESCE(SUM(amount), 0) FROM expenses
+                WHERE date >= ? AND date < ?
+            """, (date(year - 1, 12, 1), start))
+            prev_total = Decimal(str(cursor.fetchone()[0] or 0))
+
         summaries = []
         for month in range(1, 13):
-            try:
-                summaries.append(self.get_monthly_summary(year, month))
-            except Exception:
-                pass
+            total, count = totals.get(month, (Decimal(0), 0))
+            breakdown = breakdowns.get(month, {})
+
+            if month == 12:
+                month_end = date(year + 1, 1, 1) - timedelta(days=1)
+            else:
+                month_end = date(year, month + 1, 1) - timedelta(days=1)
+            days_in_month = month_end.day
+
+            vs_prev = None
+            if prev_total > 0:
+                vs_prev = float((total - prev_total) / prev_total * 100)
+
+            summaries.append(MonthlySummary(
+                year=year,
+                month=month,
+                total_spent=total,
+                transaction_count=count,
+                category_breakdown=breakdown,
+                daily_average=total / days_in_month,
+                top_category=next(iter(breakdown), ""),
+                vs_previous_month=vs_prev
+            ))
+            prev_total = total
+
         return summaries
     
     # === Data Export ===
     
-    def export_to_csv(self, filepath: str, start_date: Optional[date] = None, 
+    def export_to_csv(self, filepath: str, start_date: Optional[date] = None,
                       end_date: Optional[date] = None):
-        """Export expenses to CSV file."""
+        """Export expenses to CSV file.
+
+        Rows stream straight from the cursor to csv.writerows — no
+        intermediate Expense objects, and the comma-joined tags column
+        is written as stored.
+        """
         import csv
-        
-        expenses = self.list_expenses(start_date, end_date, limit=10000)
-        
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Date', 'Category', 'Description', 'Amount', 
-                           'Payment Method', 'Tags'])
-            for e in expenses:
-                writer.writerow([
-                    e.date.isoformat(),
-                    e.category_name,
-                    e.description,
-                    float(e.amount),
-                    e.payment_method,
-                    ', '.join(e.tags)
-                ])
+
+        query = """
+            SELECT e.date,
+                   COALESCE(c.name, 'Uncategorized'),
+                   COALESCE(e.description, ''),
+                   CAST(e.amount AS REAL),
+                   COALESCE(e.payment_method, ''),
+                   COALESCE(e.tags, '')
+            FROM expenses e
+            LEFT JOIN categories c ON e.category_id = c.id
+            WHERE 1=1
+        """
+        params = []
+        if start_date:
+            query += " AND e.date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND e.date <= ?"
+            params.append(end_date)
+        query += " ORDER BY e.date DESC, e.created_at DESC LIMIT 10000"
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+
+            with open(filepath, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['Date', 'Category', 'Description', 'Amount',
+                               'Payment Method', 'Tags'])
+                writer.writerows(
+                    (row[0], row[1], row[2], row[3], row[4],
+                     row[5].replace(",", ", "))
+                    for row in cursor
+                )
     
     def export_to_json(self, filepath: str, start_date: Optional[date] = None,
                        end_date: Optional[date] = None):
-        """Export expenses to JSON file."""
-        expenses = self.list_expenses(start_date, end_date, limit=10000)
-        
-        data = {
-            "exported_at": datetime.now().isoformat(),
-            "count": len(expenses),
-            "expenses": [
-                {
-                    "id": e.id,
-                    "date": e.date.isoformat(),
-                    "category": e.category_name,
-                    "description": e.description,
-                    "amount": float(e.amount),
-                    "payment_method": e.payment_method,
-                    "tags": e.tags,
-                    "is_recurring": e.is_recurring
-                }
-                for e in expenses
-            ]
-        }
-        
+        """Export expenses to JSON file.
+
+        The expense array is assembled inside SQLite with
+        json_group_array/json_object, so no Expense objects or Python
+        dicts are built and the payload crosses to Python as one string.
+        """
+        import json
+
+        query = """
+            SELECT COUNT(*),
+                   json_group_array(json_object(
+                       'id', id,
+                       'date', date,
+                       'category', category,
+                       'description', description,
+                       'amount', amount,
+                       'payment_method', payment_method,
+                       -- json_quote escapes quotes, backslashes and control
+                       -- characters; JSON escape sequences never contain a
+                       -- comma, so splitting on commas afterwards is safe
+                       'tags', CASE WHEN tags = '' THEN json('[]')
+                               ELSE json('[' || replace(json_quote(tags), ',', '","') || ']') END,
+                       'is_recurring', json(CASE WHEN is_recurring THEN 'true' ELSE 'false' END)
+                   ))
+            FROM (
+                SELECT e.id,
+                       e.date AS date,
+                       COALESCE(c.name, 'Uncategorized') AS category,
+                       COALESCE(e.description, '') AS description,
+                       CAST(e.amount AS REAL) AS amount,
+                       COALESCE(e.payment_method, '') AS payment_method,
+                       COALESCE(e.tags, '') AS tags,
+                       e.is_recurring AS is_recurring
+                FROM expenses e
+                LEFT JOIN categories c ON e.category_id = c.id
+                WHERE 1=1
+        """
+        params = []
+        if start_date:
+            query += " AND e.date >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND e.date <= ?"
+            params.append(end_date)
+        query += """
+                ORDER BY e.date DESC, e.created_at DESC
+                LIMIT 10000
+            )
+        """
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            count, expenses_json = cursor.fetchone()
+
         with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+            f.write('{\n  "exported_at": %s,\n  "count": %d,\n  "expenses": '
+                    % (json.dumps(datetime.now().isoformat()), count))
+            f.write(expenses_json)
+            f.write("\n}")
     
+    def data_fingerprint(self) -> Tuple[Optional[int], int, int]:
+        """Cheap change marker for the expenses table.
+
+        (MAX(id), COUNT(*)) moves on every insert, delete or bulk
+        import; the update serial covers in-place edits, which change
+        neither. Callers can key caches on the tuple.
+        """
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(id), COUNT(*) FROM expenses")
+            max_id, count = cursor.fetchone()
+            return max_id, count, self._update_serial
+
     def get_stats(self) -> dict:
         """Get database statistics."""
         with self._get_connection() as conn:
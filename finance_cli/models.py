@@ -3,10 +3,9 @@ from dataclasses import dataclass, field
 from datetime import datetime, date
 from typing import Optional, List
 from decimal import Decimal, InvalidOperation
-import json
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """Expense category with optional budget limit."""
     id: Optional[int] = None
@@ -29,7 +28,7 @@ class Category:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Expense:
     """Individual expense transaction."""
     id: Optional[int] = None
@@ -52,14 +51,17 @@ class Expense:
         id, amount, category_id, description, date, payment_method, tags, 
         is_recurring, created_at, updated_at, category_name
         """
+        # Amounts arrive as Decimal via the database layer's converter;
+        # fall back to str-conversion for raw tuples
+        amount = row[1] if isinstance(row[1], Decimal) else Decimal(str(row[1]))
         return cls(
             id=row[0],
-            amount=Decimal(str(row[1])),
+            amount=amount,
             category_id=row[2],
             description=row[3] or "",
             date=date.fromisoformat(row[4]) if row[4] else date.today(),
             payment_method=row[5] or "",
-            tags=json.loads(row[6]) if row[6] else [],
+            tags=row[6].split(",") if row[6] else [],
             is_recurring=bool(row[7]),
             created_at=datetime.fromisoformat(row[8]) if row[8] else None,
             updated_at=datetime.fromisoformat(row[9]) if row[9] else None,
@@ -67,7 +69,7 @@ class Expense:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Budget:
     """Budget setting for a category or overall."""
     id: Optional[int] = None
@@ -107,7 +109,7 @@ class Budget:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MonthlySummary:
     """Monthly spending summary."""
     year: int
@@ -120,7 +122,7 @@ class MonthlySummary:
     vs_previous_month: Optional[float] = None  # Percentage change
 
 
-@dataclass
+@dataclass(slots=True)
 class CategorySummary:
     """Category spending summary."""
     category_id: int
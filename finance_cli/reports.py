@@ -1,9 +1,12 @@
 """Report generation for Finance CLI."""
+import calendar
 from datetime import date, timedelta
 from decimal import Decimal
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
@@ -14,9 +17,63 @@ from rich import box
 from .database import Database
 from .models import MonthlySummary, CategorySummary
 from .charts import ChartRenderer, format_currency
+from ._kernels import insight_extrema
 
 
-@dataclass
+# Header month names, fixed rather than routed through strftime's
+# locale machinery on every render
+_MONTH_NAMES = ('January', 'February', 'March', 'April', 'May', 'June',
+                'July', 'August', 'September', 'October', 'November', 'December')
+
+# Header markup templates, assembled once at import; renders just
+# .format() the values in and hand the result to Text.from_markup
+_MONTHLY_HEADER = (
+    "[bold underline]Monthly Report: {month_name}[/]\n"
+    "[dim]Total Spent: [/][bold yellow]{total}[/]"
+    "[dim]  |  Transactions: [/][bold blue]{count}[/]"
+    "[dim]  |  Daily Avg: [/][bold green]{avg}[/]{vs_prev}"
+)
+
+_YEARLY_HEADER = (
+    "[bold underline]Yearly Report: {year}[/]\n"
+    "[dim]Total Spent: [/][bold yellow]{total}[/]"
+    "[dim]  |  Total Transactions: [/][bold blue]{count}[/]"
+    "[dim]  |  Monthly Avg: [/][bold green]{avg}[/]"
+)
+
+_CATEGORY_HEADER = (
+    "[bold underline]Category Report: {name}[/]\n"
+    "[dim]Period: {start} to {end}\n"
+    "Total: [/][bold yellow]{total}[/]"
+    "[dim]  |  Transactions: [/][bold blue]{count}[/]"
+    "[dim]  |  Average: [/][bold green]{avg}[/]"
+)
+
+_SUMMARY_CARD = (
+    "[bold underline]This Month[/]\n"
+    "[dim]Total: [/][bold yellow]{total}[/]  ({count} transactions)\n"
+    "{vs_prev}"
+    "\n[dim]Top Category: [/][cyan]{top_category}[/]"
+    "\n[dim]Daily Average: [/][green]{daily_avg}[/]{budget_status}"
+)
+
+
+def _vs_prev_markup(vs_previous_month: Optional[float]) -> str:
+    """Inline month-over-month fragment, red for up and green for down."""
+    if vs_previous_month is None:
+        return ""
+    if vs_previous_month > 0:
+        return f"[red]  |  vs Last Month: +{vs_previous_month:.1f}%[/]"
+    return f"[green]  |  vs Last Month: {vs_previous_month:.1f}%[/]"
+
+
+@lru_cache(maxsize=64)
+def _month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """First and last day of a month, memoized across report renders."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+@dataclass(slots=True, frozen=True)
 class SpendingInsights:
     """Generated insights from spending data."""
     biggest_category: Optional[str]
@@ -36,104 +93,104 @@ class ReportGenerator:
     def __init__(self, db: Database):
         self.db = db
         self.charts = ChartRenderer()
-    
+        # Per-instance memo so identical in-session re-renders are free;
+        # the fingerprint key invalidates it as soon as the data changes
+        self._build_monthly_report = lru_cache(maxsize=32)(self._build_monthly_report)
+
     def generate_monthly_report(
-        self, 
-        year: int, 
+        self,
+        year: int,
         month: int,
         show_charts: bool = True
     ) -> Group:
-        """Generate a comprehensive monthly report."""
+        """Generate a comprehensive monthly report (memoized until the
+        underlying expense data changes)."""
+        fingerprint = self.db.data_fingerprint()
+        return self._build_monthly_report(year, month, show_charts, fingerprint)
+
+    def _build_monthly_report(
+        self,
+        year: int,
+        month: int,
+        show_charts: bool,
+        fingerprint: Tuple
+    ) -> Group:
+        """Render the monthly report; fingerprint is only a cache key."""
+        return Group(*self._iter_monthly_report(year, month, show_charts))
+
+    def _iter_monthly_report(self, year: int, month: int, show_charts: bool):
+        """Yield the monthly report's renderables as they are built."""
         summary = self.db.get_monthly_summary(year, month)
-        category_data = self.db.get_spending_by_category(
-            date(year, month, 1),
-            date(year, month, 28) if month == 2 else date(year, month, 30)
-        )
-        
-        elements = []
-        
-        # Header panel
-        month_name = date(year, month, 1).strftime("%B %Y")
-        header_text = Text()
-        header_text.append(f"Monthly Report: {month_name}\n", style="bold underline")
-        header_text.append(f"Total Spent: ", style="dim")
-        header_text.append(format_currency(summary.total_spent), style="bold yellow")
-        header_text.append(f"  |  Transactions: ", style="dim")
-        header_text.append(str(summary.transaction_count), style="bold blue")
-        header_text.append(f"  |  Daily Avg: ", style="dim")
-        header_text.append(format_currency(summary.daily_average), style="bold green")
-        
-        if summary.vs_previous_month is not None:
-            if summary.vs_previous_month > 0:
-                header_text.append(f"  |  vs Last Month: +{summary.vs_previous_month:.1f}%", style="red")
-            else:
-                header_text.append(f"  |  vs Last Month: {summary.vs_previous_month:.1f}%", style="green")
-        
-        elements.append(Panel(header_text, border_style="blue"))
-        
+        # _month_bounds covers 31-day months and leap Februarys, which
+        # the old 28/30 guess cut short
+        category_data = self.db.get_spending_by_category(*_month_bounds(year, month))
+
+        # Header panel: one markup parse instead of per-append style
+        # resolution
+        header_text = Text.from_markup(_MONTHLY_HEADER.format(
+            month_name=f"{_MONTH_NAMES[month - 1]} {year}",
+            total=format_currency(summary.total_spent),
+            count=summary.transaction_count,
+            avg=format_currency(summary.daily_average),
+            vs_prev=_vs_prev_markup(summary.vs_previous_month)
+        ))
+
+        yield Panel(header_text, border_style="blue")
+
         # Category breakdown
         if category_data:
-            cat_table = self.charts.render_category_breakdown(category_data)
-            elements.append(cat_table)
-            
+            yield self.charts.render_category_breakdown(category_data)
+
             # Bar chart
             if show_charts:
                 chart_data = {c.category_name: c.total_spent for c in category_data}
-                bar_chart = self.charts.render_bar_chart(chart_data, "Spending by Category")
-                elements.append(bar_chart)
-        
+                yield self.charts.render_bar_chart(chart_data, "Spending by Category")
+
         # Insights
         insights = self._generate_insights(category_data, summary)
         if insights.recommendations:
             rec_text = "\n".join(f"• {r}" for r in insights.recommendations[:5])
-            elements.append(Panel(rec_text, title="💡 Insights", border_style="green"))
-        
-        return Group(*elements)
+            yield Panel(rec_text, title="💡 Insights", border_style="green")
     
     def generate_yearly_report(self, year: int) -> Group:
         """Generate a comprehensive yearly report."""
+        return Group(*self._iter_yearly_report(year))
+
+    def _iter_yearly_report(self, year: int):
+        """Yield the yearly report's renderables as they are built."""
         monthly_summaries = self.db.get_yearly_summary(year)
-        
-        elements = []
-        
-        # Calculate yearly totals
-        yearly_total = sum(s.total_spent for s in monthly_summaries)
-        yearly_count = sum(s.transaction_count for s in monthly_summaries)
-        
+
+        # Yearly totals come from one aggregate query; the monthly
+        # summaries are kept only for the table and sparkline below
+        yearly_total, yearly_count = self.db.get_yearly_totals(year)
+
         # Header
-        header_text = Text()
-        header_text.append(f"Yearly Report: {year}\n", style="bold underline")
-        header_text.append(f"Total Spent: ", style="dim")
-        header_text.append(format_currency(yearly_total), style="bold yellow")
-        header_text.append(f"  |  Total Transactions: ", style="dim")
-        header_text.append(str(yearly_count), style="bold blue")
-        header_text.append(f"  |  Monthly Avg: ", style="dim")
-        header_text.append(format_currency(yearly_total / 12), style="bold green")
-        
-        elements.append(Panel(header_text, border_style="blue"))
-        
+        header_text = Text.from_markup(_YEARLY_HEADER.format(
+            year=year,
+            total=format_currency(yearly_total),
+            count=yearly_count,
+            avg=format_currency(yearly_total / 12)
+        ))
+
+        yield Panel(header_text, border_style="blue")
+
         # Monthly breakdown table
-        monthly_table = self.charts.render_monthly_comparison(monthly_summaries)
-        elements.append(monthly_table)
-        
+        yield self.charts.render_monthly_comparison(monthly_summaries)
+
         # Monthly trend sparkline
         monthly_values = [s.total_spent for s in monthly_summaries]
-        sparkline = self.charts.render_sparkline(monthly_values, "Monthly Spending Trend")
-        elements.append(sparkline)
-        
-        # Top categories for the year
+        yield self.charts.render_sparkline(monthly_values, "Monthly Spending Trend")
+
+        # Top categories for the year, limited in SQL
         start_date = date(year, 1, 1)
         end_date = date(year, 12, 31)
-        category_data = self.db.get_spending_by_category(start_date, end_date)
-        
+        category_data = self.db.get_spending_by_category(start_date, end_date, top_n=5)
+
         if category_data:
-            cat_table = self.charts.render_category_breakdown(
-                category_data[:5], 
+            yield self.charts.render_category_breakdown(
+                category_data,
                 "Top 5 Categories"
             )
-            elements.append(cat_table)
-        
-        return Group(*elements)
     
     def generate_category_report(
         self,
@@ -146,32 +203,39 @@ class ReportGenerator:
             end_date = date.today()
         if not start_date:
             start_date = end_date - timedelta(days=90)
-        
-        expenses = self.db.list_expenses(start_date, end_date, category_id)
-        
-        # Get category info
-        categories = self.db.get_categories()
-        category = next((c for c in categories if c.id == category_id), None)
+        return Group(*self._iter_category_report(category_id, start_date, end_date))
+
+    def _iter_category_report(self, category_id: int, start_date: date, end_date: date):
+        """Yield the category report's renderables as they are built."""
+        # Only the 20 rows the table shows leave SQLite, as narrow
+        # tuples straight off the (category_id, date) index — no
+        # category-name join, no Expense objects; the header totals
+        # come from the aggregate query below
+        expenses = self.db.list_expense_rows(start_date, end_date, category_id, limit=20)
+
+        # Get category info with a targeted primary-key fetch rather
+        # than loading and scanning the whole category table
+        category = self.db.get_category_by_id(category_id)
         cat_name = category.name if category else "Unknown"
-        
-        elements = []
-        
-        # Header
-        total = sum(e.amount for e in expenses)
-        avg = total / len(expenses) if expenses else Decimal(0)
-        
-        header_text = Text()
-        header_text.append(f"Category Report: {cat_name}\n", style="bold underline")
-        header_text.append(f"Period: {start_date} to {end_date}\n", style="dim")
-        header_text.append(f"Total: ", style="dim")
-        header_text.append(format_currency(total), style="bold yellow")
-        header_text.append(f"  |  Transactions: ", style="dim")
-        header_text.append(str(len(expenses)), style="bold blue")
-        header_text.append(f"  |  Average: ", style="dim")
-        header_text.append(format_currency(avg), style="bold green")
-        
-        elements.append(Panel(header_text, border_style="blue"))
-        
+
+        # Header. Total and count come from one SQL aggregate over the
+        # whole period instead of a Decimal-by-Decimal sum of the
+        # fetched page (which also silently capped both at the list
+        # limit); Decimal only survives to the format_currency boundary
+        total, count = self.db.expense_totals(start_date, end_date, category_id)
+        avg = total / count if count else Decimal(0)
+
+        header_text = Text.from_markup(_CATEGORY_HEADER.format(
+            name=cat_name,
+            start=start_date,
+            end=end_date,
+            total=format_currency(total),
+            count=count,
+            avg=format_currency(avg)
+        ))
+
+        yield Panel(header_text, border_style="blue")
+
         # Recent transactions
         if expenses:
             table = Table(show_header=True, header_style="bold magenta")
@@ -179,61 +243,60 @@ class ReportGenerator:
             table.add_column("Description", style="white")
             table.add_column("Amount", justify="right", style="yellow")
             table.add_column("Method", style="dim")
-            
-            for e in expenses[:20]:  # Show last 20
+
+            for exp_date, description, amount, payment_method in expenses:
                 table.add_row(
-                    str(e.date),
-                    e.description[:40] or "-",
-                    format_currency(e.amount),
-                    e.payment_method or "-"
+                    str(exp_date),
+                    (description or "")[:40] or "-",
+                    format_currency(amount),
+                    payment_method or "-"
                 )
-            
-            elements.append(table)
-        
-        return Group(*elements)
+
+            yield table
     
     def generate_budget_report(self) -> Group:
         """Generate budget status report."""
-        budgets = self.db.get_budgets()
-        
-        if not budgets:
-            return Group(Panel("No budgets set. Use 'finance budget set' to create budgets.", 
-                              border_style="yellow"))
-        
-        # Get actual spending for each budget
+        # One JOIN returns each budget with its month-to-date spend,
+        # replacing the budgets query plus a per-category aggregation
         today = date.today()
         start_of_month = today.replace(day=1)
-        
-        category_ids = [b.category_id for b in budgets if b.category_id]
-        spending_data = self.db.get_spending_by_category(start_of_month, today)
-        
-        actual_spending = {0: Decimal(0)}  # Overall budget key
-        for s in spending_data:
-            actual_spending[s.category_id] = s.total_spent
-            actual_spending[0] += s.total_spent
-        
-        elements = []
-        
+        status = self.db.get_budget_status(start_of_month, today)
+
+        if not status:
+            return Group(Panel("No budgets set. Use 'finance budget set' to create budgets.",
+                              border_style="yellow"))
+        return Group(*self._iter_budget_report(status))
+
+    def _iter_budget_report(self, status):
+        """Yield the budget report's renderables as they are built."""
+        budgets = [budget for budget, _ in status]
+        actual_spending = {budget.category_id or 0: spent for budget, spent in status}
+
         # Budget overview table
-        budget_table = self.charts.render_budget_overview(budgets, actual_spending)
-        elements.append(budget_table)
-        
-        # Alert panel for budgets over threshold
+        yield self.charts.render_budget_overview(budgets, actual_spending)
+
+        # Alert panel for budgets over threshold. Percentages and both
+        # threshold comparisons happen on parallel arrays; Python only
+        # formats the rows that actually alert
+        n = len(status)
+        amounts = np.fromiter((float(b.amount) for b, _ in status), np.float64, count=n)
+        spents = np.fromiter((float(spent) for _, spent in status), np.float64, count=n)
+        thresholds = np.fromiter((b.alert_threshold for b, _ in status), np.float64, count=n)
+        pcts = np.divide(spents, amounts, out=np.zeros(n), where=amounts > 0) * 100
+        over = (pcts >= 100) & (amounts > 0)
+        warn = (pcts >= thresholds) & (amounts > 0) & ~over
+
         alerts = []
-        for budget in budgets:
-            spent = actual_spending.get(budget.category_id or 0, Decimal(0))
-            if budget.amount > 0:
-                pct = float(spent / budget.amount * 100)
-                if pct >= 100:
-                    alerts.append(f"🔴 {budget.category_name}: {pct:.0f}% over budget!")
-                elif pct >= budget.alert_threshold:
-                    alerts.append(f"🟡 {budget.category_name}: {pct:.0f}% of budget used")
-        
+        for i in np.flatnonzero(over | warn):
+            name = status[i][0].category_name
+            if over[i]:
+                alerts.append(f"🔴 {name}: {pcts[i]:.0f}% over budget!")
+            else:
+                alerts.append(f"🟡 {name}: {pcts[i]:.0f}% of budget used")
+
         if alerts:
-            elements.append(Panel("\n".join(alerts), title="Budget Alerts", 
-                                 border_style="red"))
-        
-        return Group(*elements)
+            yield Panel("\n".join(alerts), title="Budget Alerts",
+                        border_style="red")
     
     def _generate_insights(
         self,
@@ -242,11 +305,25 @@ class ReportGenerator:
     ) -> SpendingInsights:
         """Generate spending insights and recommendations."""
         recommendations = []
-        
-        biggest = max(category_data, key=lambda x: x.total_spent) if category_data else None
-        most_frequent = max(category_data, key=lambda x: x.transaction_count) if category_data else None
-        
-        avg_transaction = (summary.total_spent / summary.transaction_count 
+
+        # Find both extrema in one compiled pass over float arrays
+        # instead of two max() scans comparing Decimals
+        if category_data:
+            totals = np.fromiter(
+                (float(c.total_spent) for c in category_data), np.float64,
+                count=len(category_data)
+            )
+            counts = np.fromiter(
+                (c.transaction_count for c in category_data), np.int64,
+                count=len(category_data)
+            )
+            i_big, i_freq = insight_extrema(totals, counts)
+            biggest = category_data[i_big]
+            most_frequent = category_data[i_freq]
+        else:
+            biggest = most_frequent = None
+
+        avg_transaction = (summary.total_spent / summary.transaction_count
                           if summary.transaction_count > 0 else Decimal(0))
         
         # Budget warnings
@@ -298,47 +375,38 @@ class ReportGenerator:
     def generate_summary_card(self) -> Panel:
         """Generate a quick summary card of current financial status."""
         today = date.today()
-        start_of_month = today.replace(day=1)
-        
-        # This month
+
+        # One summary covers the card: the month-over-month comparison
+        # is already part of it, so no second query for last month
         month_summary = self.db.get_monthly_summary(today.year, today.month)
-        
-        # Last month for comparison
-        last_month = today.replace(day=1) - timedelta(days=1)
-        last_month_summary = self.db.get_monthly_summary(last_month.year, last_month.month)
-        
-        # Build content
-        content = Text()
-        
-        content.append("This Month\n", style="bold underline")
-        content.append(f"Total: ", style="dim")
-        content.append(format_currency(month_summary.total_spent), style="bold yellow")
-        content.append(f"  ({month_summary.transaction_count} transactions)\n")
-        
+
+        # Build the whole card as one markup string and parse it once
+        vs_prev = ""
         if month_summary.vs_previous_month is not None:
             if month_summary.vs_previous_month > 0:
-                content.append(f"vs Last Month: +{month_summary.vs_previous_month:.1f}%", style="red")
+                vs_prev = f"[red]vs Last Month: +{month_summary.vs_previous_month:.1f}%[/]\n"
             else:
-                content.append(f"vs Last Month: {month_summary.vs_previous_month:.1f}%", style="green")
-            content.append("\n")
-        
-        content.append(f"\nTop Category: ", style="dim")
-        content.append(month_summary.top_category or "N/A", style="cyan")
-        content.append(f"\nDaily Average: ", style="dim")
-        content.append(format_currency(month_summary.daily_average), style="green")
-        
-        # Budget status
+                vs_prev = f"[green]vs Last Month: {month_summary.vs_previous_month:.1f}%[/]\n"
+
+        budget_status = ""
         budgets = self.db.get_budgets()
         if budgets:
             total_budget = sum(b.amount for b in budgets if b.category_id is None)
             if total_budget > 0:
-                content.append(f"\n\nBudget Status: ", style="bold underline")
                 pct = float(month_summary.total_spent / total_budget * 100)
-                if pct >= 100:
-                    content.append(f"{pct:.0f}% used", style="red")
-                elif pct >= 80:
-                    content.append(f"{pct:.0f}% used", style="yellow")
-                else:
-                    content.append(f"{pct:.0f}% used", style="green")
-        
+                color = "red" if pct >= 100 else "yellow" if pct >= 80 else "green"
+                budget_status = (
+                    f"\n\n[bold underline]Budget Status: [/]"
+                    f"[{color}]{pct:.0f}% used[/]"
+                )
+
+        content = Text.from_markup(_SUMMARY_CARD.format(
+            total=format_currency(month_summary.total_spent),
+            count=month_summary.transaction_count,
+            vs_prev=vs_prev,
+            top_category=month_summary.top_category or "N/A",
+            daily_avg=format_currency(month_summary.daily_average),
+            budget_status=budget_status
+        ))
+
         return Panel(content, title="📊 Financial Summary", border_style="blue")